@@ -18,10 +18,11 @@ Environment Variables Required:
     HELICONE_API_KEY: Your Helicone API key (optional for demo)
 """
 
+import argparse
 import asyncio
 import os
 import sys
-import json
+import orjson
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -30,11 +31,128 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 from llm.llm_gateway import LLMGateway
 from llm.helicone_client import HeliconeConfig
-from models import ChatRequest, UserRole
+from models import ChatRequest, ChatResponse, UserRole
+
+
+async def run_scenarios_via_batch(gateway, scenarios):
+    """Submit scenarios through the OpenAI Batch API instead of live calls.
+
+    Batch requests bill at half the synchronous rate and draw on separate
+    rate-limit quota, which suits a non-interactive demo; the trade-off is
+    a completion window of up to 24 hours. Parsed results are routed back
+    through the gateway's cost tracker and response cache so analytics and
+    the cache-hit scenarios behave exactly as in the live path.
+
+    Returns a list aligned with scenarios of (response, metadata, seconds)
+    tuples or exceptions, matching the live runner's shape.
+    """
+    client = gateway.helicone_client.client
+    loop = asyncio.get_running_loop()
+
+    routed = []
+    lines = []
+    for index, scenario in enumerate(scenarios):
+        routing = gateway.model_router.select_model(scenario["message"], scenario["role"])
+        model_config = routing["model_config"]
+        routed.append((scenario, model_config))
+        lines.append(orjson.dumps({
+            "custom_id": str(index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model_config.model,
+                "messages": [{"role": "user", "content": routing["optimized_message"]}],
+                "max_tokens": model_config.max_tokens,
+                "temperature": model_config.temperature,
+            },
+        }).decode())
+
+    start = loop.time()
+    batch_file = client.files.create(
+        file=("demo_scenarios.jsonl", "\n".join(lines).encode()),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"   📦 Batch {batch.id} submitted ({len(lines)} requests), polling for completion...")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(10)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch finished with status '{batch.status}'")
+
+    window_seconds = loop.time() - start
+    output = client.files.content(batch.output_file_id).content
+
+    results_by_id = {}
+    for raw in output.splitlines():
+        if raw.strip():
+            line = orjson.loads(raw)
+            results_by_id[line["custom_id"]] = line
+
+    outcomes = []
+    for index, (scenario, model_config) in enumerate(routed):
+        line = results_by_id.get(str(index))
+        if line is None or line.get("error"):
+            reason = line["error"] if line else "missing from output file"
+            outcomes.append(RuntimeError(f"Batch item failed: {reason}"))
+            continue
+
+        body = line["response"]["body"]
+        content = body["choices"][0]["message"]["content"]
+        usage = body.get("usage") or {}
+
+        session_id = f"demo_session_{scenario['role'].value}"
+        cost_data = gateway.helicone_client._calculate_cost(
+            model=model_config.model,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            user_role=scenario["role"],
+            session_id=session_id,
+        )
+        # The Batch API bills at 50% of the synchronous price
+        cost_data.cost_usd *= 0.5
+        gateway.cost_tracker.record_cost(cost_data)
+
+        # Populate the response cache so duplicate scenarios hit it
+        messages = [{"role": "user", "content": scenario["message"]}]
+        cache_key = gateway._generate_cache_key(messages, scenario["role"])
+        gateway._cache_response(cache_key, {
+            "content": content,
+            "model": model_config.model,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "user_role": scenario["role"].value,
+            "tokens_used": cost_data.total_tokens,
+            "cost_usd": cost_data.cost_usd,
+        })
+
+        metadata = {
+            "cost": cost_data.cost_usd,
+            "latency_ms": int(window_seconds * 1000),
+            "model_used": model_config.model,
+            "cache_hit": False,
+            "tokens_used": cost_data.total_tokens,
+            "batch_api": True,
+        }
+        outcomes.append((ChatResponse(response=content, metadata=metadata), metadata, window_seconds))
+
+    return outcomes
 
 
 async def main():
     """Main demo function."""
+    parser = argparse.ArgumentParser(description="Helicone Integration Demo")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Submit scenarios via the OpenAI Batch API (50%% cost, up to 24h window)"
+    )
+    args = parser.parse_args()
+
     print("🚀 Secure Medical Chat - Helicone Integration Demo")
     print("=" * 60)
     
@@ -105,6 +223,13 @@ async def main():
             "message": "I have a headache. What could be causing it?",  # Same as first query
             "expected_model": "gpt-3.5-turbo",
             "should_cache": True
+        },
+        {
+            "name": "Patient Paraphrased Query",
+            "role": UserRole.PATIENT,
+            "message": "What's making my head hurt?",  # Paraphrase of the first query
+            "expected_model": "gpt-3.5-turbo",
+            "should_cache": True  # Served by the semantic cache layer
         }
     ]
     
@@ -113,70 +238,109 @@ async def main():
     
     total_cost = 0.0
     scenario_results = []
-    
-    for i, scenario in enumerate(demo_scenarios, 1):
-        print(f"\n{i}. {scenario['name']}")
-        print(f"   Role: {scenario['role'].value}")
-        print(f"   Expected Model: {scenario['expected_model']}")
-        
-        # Create chat request
+
+    loop = asyncio.get_running_loop()
+
+    async def _run_scenario(scenario, index):
         request = ChatRequest(
             message=scenario["message"],
             user_role=scenario["role"],
             session_id=f"demo_session_{scenario['role'].value}",
-            user_id=f"demo_user_{i}"
+            user_id=f"demo_user_{index}"
         )
-        
-        try:
-            start_time = datetime.now()
-            
-            # Process request through gateway
-            response, metadata = await gateway.process_chat_request(request)
-            
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
-            
-            # Display results
-            print(f"   ✅ Response received in {processing_time:.2f}s")
-            print(f"   💰 Cost: ${metadata['cost']:.4f}")
-            print(f"   🤖 Model Used: {metadata['model_used']}")
-            print(f"   💾 Cache Hit: {'Yes' if metadata['cache_hit'] else 'No'}")
-            print(f"   🎯 Tokens: {metadata.get('tokens_used', 0)}")
-            print(f"   🕒 Latency: {metadata['latency_ms']}ms")
-            
-            # Verify model selection
-            if metadata['model_used'] == scenario['expected_model']:
-                print(f"   ✅ Model selection correct")
-            else:
-                print(f"   ⚠️  Expected {scenario['expected_model']}, got {metadata['model_used']}")
-            
-            # Verify caching
-            if scenario.get('should_cache') and metadata['cache_hit']:
-                print(f"   ✅ Cache working correctly")
-            elif scenario.get('should_cache') and not metadata['cache_hit']:
-                print(f"   ⚠️  Expected cache hit, but got cache miss")
-            
-            # Show response preview
-            response_preview = response.response[:100] + "..." if len(response.response) > 100 else response.response
-            print(f"   📄 Response: {response_preview}")
-            
-            total_cost += metadata['cost']
-            
+        # loop.time() is the loop's monotonic clock - no datetime
+        # allocation inside the timed span
+        start = loop.time()
+        # Consume the token stream: the preview could display as soon as
+        # the first delta lands, long before GPT-4 finishes a long answer.
+        # The stream is drained fully so cost recording and caching run.
+        parts = []
+        first_token_s = None
+        metadata = None
+        async for chunk in gateway.stream_chat_request(request):
+            if chunk.final:
+                metadata = chunk.metadata
+            elif chunk.delta:
+                if first_token_s is None:
+                    first_token_s = loop.time() - start
+                parts.append(chunk.delta)
+        metadata["first_token_ms"] = int((first_token_s or 0) * 1000)
+        response = ChatResponse(response="".join(parts), metadata=metadata)
+        return response, metadata, loop.time() - start
+
+    # The distinct scenarios are independent, so their OpenAI round-trips
+    # overlap in one gather; the duplicate cache-test scenarios run in a
+    # second phase afterwards so their lookups see the populated cache.
+    first_pass = [s for s in demo_scenarios if not s.get("should_cache")]
+    cache_pass = [s for s in demo_scenarios if s.get("should_cache")]
+    ordered = first_pass + cache_pass
+
+    if args.batch:
+        # Distinct scenarios go through the Batch API; the duplicate
+        # cache-test scenarios still run live so they exercise the
+        # cache the batch results populated
+        outcomes = await run_scenarios_via_batch(gateway, first_pass)
+    else:
+        outcomes = list(await asyncio.gather(
+            *(_run_scenario(s, i) for i, s in enumerate(first_pass, 1)),
+            return_exceptions=True,
+        ))
+    outcomes += list(await asyncio.gather(
+        *(_run_scenario(s, i) for i, s in enumerate(cache_pass, len(first_pass) + 1)),
+        return_exceptions=True,
+    ))
+
+    for i, (scenario, outcome) in enumerate(zip(ordered, outcomes), 1):
+        print(f"\n{i}. {scenario['name']}")
+        print(f"   Role: {scenario['role'].value}")
+        print(f"   Expected Model: {scenario['expected_model']}")
+
+        if isinstance(outcome, Exception):
+            print(f"   ❌ Error: {str(outcome)}")
             scenario_results.append({
                 "scenario": scenario['name'],
-                "cost": metadata['cost'],
-                "model": metadata['model_used'],
-                "cache_hit": metadata['cache_hit'],
-                "tokens": metadata.get('tokens_used', 0),
-                "latency_ms": metadata['latency_ms']
+                "error": str(outcome)
             })
+            continue
+
+        response, metadata, processing_time = outcome
+
+        # Display results
+        print(f"   ✅ Response received in {processing_time:.2f}s")
+        print(f"   💰 Cost: ${metadata['cost']:.4f}")
+        print(f"   🤖 Model Used: {metadata['model_used']}")
+        print(f"   💾 Cache Hit: {'Yes' if metadata['cache_hit'] else 'No'}")
+        print(f"   🎯 Tokens: {metadata.get('tokens_used', 0)}")
+        print(f"   🕒 Latency: {metadata['latency_ms']}ms")
+        if metadata.get('first_token_ms'):
+            print(f"   ⚡ First Token: {metadata['first_token_ms']}ms")
+
+        # Verify model selection
+        if metadata['model_used'] == scenario['expected_model']:
+            print(f"   ✅ Model selection correct")
+        else:
+            print(f"   ⚠️  Expected {scenario['expected_model']}, got {metadata['model_used']}")
+
+        # Verify caching
+        if scenario.get('should_cache') and metadata['cache_hit']:
+            print(f"   ✅ Cache working correctly")
+        elif scenario.get('should_cache') and not metadata['cache_hit']:
+            print(f"   ⚠️  Expected cache hit, but got cache miss")
+
+        # Show response preview
+        response_preview = response.response[:100] + "..." if len(response.response) > 100 else response.response
+        print(f"   📄 Response: {response_preview}")
             
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
-            scenario_results.append({
-                "scenario": scenario['name'],
-                "error": str(e)
-            })
+        total_cost += metadata['cost']
+
+        scenario_results.append({
+            "scenario": scenario['name'],
+            "cost": metadata['cost'],
+            "model": metadata['model_used'],
+            "cache_hit": metadata['cache_hit'],
+            "tokens": metadata.get('tokens_used', 0),
+            "latency_ms": metadata['latency_ms']
+        })
     
     print(f"\n💰 Total Demo Cost: ${total_cost:.4f}")
     
@@ -185,7 +349,9 @@ async def main():
     print("=" * 40)
     
     try:
-        # Get real-time metrics
+        # Get real-time metrics; flush buffered cost rows first so the
+        # metrics reflect every scenario that just ran
+        gateway.flush_costs()
         print("\n📈 Real-time Metrics:")
         metrics = gateway.get_metrics(period_hours=1)
         
@@ -311,17 +477,29 @@ async def main():
     print(f"\n🎉 Demo Completed Successfully!")
     print("=" * 40)
     
+    # One pass over the results: each row's fields are read while the
+    # dict is hot instead of re-walking the list per statistic
+    successful_scenarios = []
+    models_used = set()
+    latency_total = 0
+    cache_hits = 0
+    for result in scenario_results:
+        if 'model' in result:
+            models_used.add(result['model'])
+        if 'error' not in result:
+            successful_scenarios.append(result)
+            latency_total += result['latency_ms']
+            cache_hits += result['cache_hit']
+
     print(f"\n📋 Summary:")
     print(f"   Scenarios Executed: {len(scenario_results)}")
     print(f"   Total Cost: ${total_cost:.4f}")
-    print(f"   Models Used: {set(r.get('model', 'unknown') for r in scenario_results if 'model' in r)}")
-    
-    successful_scenarios = [r for r in scenario_results if 'error' not in r]
+    print(f"   Models Used: {models_used}")
+
     if successful_scenarios:
-        avg_latency = sum(r['latency_ms'] for r in successful_scenarios) / len(successful_scenarios)
-        cache_hits = sum(1 for r in successful_scenarios if r['cache_hit'])
+        avg_latency = latency_total / len(successful_scenarios)
         cache_rate = cache_hits / len(successful_scenarios) * 100
-        
+
         print(f"   Average Latency: {avg_latency:.0f}ms")
         print(f"   Cache Hit Rate: {cache_rate:.1f}%")
     
@@ -341,17 +519,16 @@ async def main():
     
     # Export results for analysis
     results_file = "demo_results.json"
-    with open(results_file, 'w') as f:
-        json.dump({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "total_cost": total_cost,
-            "scenarios": scenario_results,
-            "summary": {
-                "scenarios_executed": len(scenario_results),
-                "successful_scenarios": len(successful_scenarios),
-                "total_cost": total_cost
-            }
-        }, f, indent=2)
+    Path(results_file).write_bytes(orjson.dumps({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "total_cost": total_cost,
+        "scenarios": scenario_results,
+        "summary": {
+            "scenarios_executed": len(scenario_results),
+            "successful_scenarios": len(successful_scenarios),
+            "total_cost": total_cost
+        }
+    }, option=orjson.OPT_INDENT_2))
     
     print(f"   Results exported to: {results_file}")
 
@@ -8,7 +8,11 @@ variables are validated and configured in different scenarios.
 
 import os
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import patch
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -16,107 +20,241 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from config import ConfigManager, ConfigurationError
 
 
+def emit(*lines):
+    """Write several output lines with one stdout write instead of a
+    lock/format/flush cycle per print call."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+@lru_cache(maxsize=64)
+def _load_cached(env_items):
+    """Memoized load_config() keyed on the applied env overlay.
+
+    Callers apply the overlay to os.environ first and pass
+    frozenset(env.items()) as the key; scenarios that share the same env
+    (the base_env repeats across most of them) reuse the validated
+    Config instead of re-running the full parse/validate pass. Failing
+    scenarios raise and are never cached.
+    """
+    return ConfigManager().load_config()
+
+
+@dataclass(frozen=True, slots=True)
+class JwtScenario:
+    """One JWT validation scenario; frozen + slotted so the module-level
+    tables are allocated once and attribute access skips dict lookups."""
+    name: str
+    description: str
+    env: MappingProxyType
+    should_fail: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class EntityScenario:
+    name: str
+    description: str
+    entities: str
+    should_fail: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class ComboScenario:
+    name: str
+    jwt_secret: str
+    entities: str
+    environment: str
+    jwt_expiry: str
+
+
+# Per-scenario output templates, compiled once at import; the loops fill
+# them with format_map instead of rebuilding the same f-strings per pass
+_JWT_OK_TMPL = (
+    "   ✅ JWT Secret: '{head}...' (length: {n})\n"
+    "   Environment: {env}\n"
+    "   Algorithm: {alg}\n"
+    "   Expiry: {exp} minutes"
+)
+
+_ENTITY_OK_TMPL = (
+    "   ✅ Entity Count: {n}\n"
+    "   Entities: {entities}\n"
+    "   PII Redaction Enabled: {redaction}"
+)
+
+_COMBO_OK_TMPL = (
+    "   ✅ Configuration loaded successfully!\n"
+    "   Environment: {env}\n"
+    "   JWT Secret Length: {secret_len} characters\n"
+    "   JWT Expiry: {exp} minutes ({hours:.1f} hours)\n"
+    "   PII Entities: {n} types\n"
+    "   Entity Types: {head}{ellipsis}\n"
+    "   Security Score: {score}/5"
+)
+
+_JWT_SCENARIOS = (
+    JwtScenario(
+        name="❌ Default JWT Secret in Production",
+        description="Should fail validation in production environment",
+        env=MappingProxyType({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-test-key",
+            "JWT_SECRET_KEY": "your-super-secret-jwt-key-change-this-in-production",
+            "ENVIRONMENT": "production"
+        }),
+        should_fail=True
+    ),
+    JwtScenario(
+        name="⚠️  Default JWT Secret in Development",
+        description="Should warn but allow in development environment",
+        env=MappingProxyType({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-test-key",
+            "JWT_SECRET_KEY": "your-super-secret-jwt-key-change-this-in-production",
+            "ENVIRONMENT": "development"
+        })
+    ),
+    JwtScenario(
+        name="⚠️  Short JWT Secret",
+        description="Should warn about short key length",
+        env=MappingProxyType({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-test-key",
+            "JWT_SECRET_KEY": "short-key",
+            "ENVIRONMENT": "development"
+        })
+    ),
+    JwtScenario(
+        name="✅ Secure JWT Secret in Production",
+        description="Should pass validation with secure key",
+        env=MappingProxyType({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-test-key",
+            "JWT_SECRET_KEY": "super-secure-production-key-with-sufficient-length-for-security",
+            "ENVIRONMENT": "production"
+        })
+    ),
+    JwtScenario(
+        name="✅ Custom JWT Secret in Development",
+        description="Should pass validation with custom key",
+        env=MappingProxyType({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-test-key",
+            "JWT_SECRET_KEY": "custom-development-secret-key-for-testing-purposes",
+            "ENVIRONMENT": "development"
+        })
+    ),
+)
+
+_ENTITY_SCENARIOS = (
+    EntityScenario(
+        name="🏥 Maximum Medical Security",
+        description="Comprehensive PII/PHI detection for medical facilities",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION,CREDIT_CARD,US_PASSPORT,US_DRIVER_LICENSE,US_BANK_NUMBER,IBAN_CODE,IP_ADDRESS"
+    ),
+    EntityScenario(
+        name="🏢 Standard Healthcare",
+        description="Standard PII/PHI detection for healthcare applications",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION"
+    ),
+    EntityScenario(
+        name="💰 Cost-Optimized",
+        description="Essential PII detection only to minimize processing costs",
+        entities="PERSON,EMAIL_ADDRESS,PHONE_NUMBER,MEDICAL_LICENSE"
+    ),
+    EntityScenario(
+        name="🔬 Research Environment",
+        description="Balanced detection for research with patient data",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,LOCATION"
+    ),
+    EntityScenario(
+        name="🎯 Minimal Demo",
+        description="Basic detection for demonstrations and testing",
+        entities="PERSON,EMAIL_ADDRESS"
+    ),
+    EntityScenario(
+        name="❌ Empty Entities (Should Fail)",
+        description="Empty entity list should fail validation",
+        entities="",
+        should_fail=True
+    ),
+)
+
+_COMBINATIONS = (
+    ComboScenario(
+        name="🏥 High-Security Medical Facility",
+        jwt_secret="ultra-secure-medical-facility-jwt-key-256-bit-encryption",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION,CREDIT_CARD,US_PASSPORT,US_DRIVER_LICENSE",
+        environment="production",
+        jwt_expiry="240"  # 4 hours
+    ),
+    ComboScenario(
+        name="🚀 Production Healthcare",
+        jwt_secret="production-healthcare-jwt-secret-from-vault",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION",
+        environment="production",
+        jwt_expiry="480"  # 8 hours
+    ),
+    ComboScenario(
+        name="🔬 Research Environment",
+        jwt_secret="research-environment-jwt-key-for-long-sessions",
+        entities="PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,LOCATION",
+        environment="development",
+        jwt_expiry="1440"  # 24 hours
+    ),
+    ComboScenario(
+        name="💰 Cost-Optimized Setup",
+        jwt_secret="cost-optimized-jwt-secret-key",
+        entities="PERSON,EMAIL_ADDRESS,PHONE_NUMBER,MEDICAL_LICENSE",
+        environment="production",
+        jwt_expiry="720"  # 12 hours
+    ),
+)
+
+
+def _run_scenario(env, render_ok, should_fail=False, error_label="UNEXPECTED FAILURE"):
+    """Shared hot path for every demonstrate_* scenario: apply the env
+    overlay, load the (memoized) config and dispatch to the scenario's
+    success renderer. Written once so the env-swap/load/except dance
+    isn't re-implemented per section.
+
+    patch.dict applies the overlay in one update and restores it in one
+    pass on exit - no per-key save/restore loops, and the restore
+    rewrites only the Python-side dict (no libc putenv per key).
+    """
+    with patch.dict(os.environ, env):
+        try:
+            config = _load_cached(frozenset(env.items()))
+        except ConfigurationError as e:
+            if should_fail:
+                print(f"   ✅ EXPECTED FAILURE: {str(e)}")
+            else:
+                print(f"   ❌ {error_label}: {str(e)}")
+            return
+
+    if should_fail:
+        print("   ❌ UNEXPECTED: Configuration should have failed but passed")
+    else:
+        render_ok(config)
+
+
 def demonstrate_jwt_secret_validation():
     """Demonstrate JWT_SECRET_KEY validation in different environments."""
     print("🔐 JWT_SECRET_KEY Configuration Demonstration")
     print("=" * 70)
     print("\nDemonstrating JWT secret key validation for different environments:\n")
-    
-    scenarios = [
-        {
-            "name": "❌ Default JWT Secret in Production",
-            "description": "Should fail validation in production environment",
-            "env": {
-                "LLM_PROVIDER": "openai",
-                "OPENAI_API_KEY": "sk-test-key",
-                "JWT_SECRET_KEY": "your-super-secret-jwt-key-change-this-in-production",
-                "ENVIRONMENT": "production"
-            },
-            "should_fail": True
-        },
-        {
-            "name": "⚠️  Default JWT Secret in Development",
-            "description": "Should warn but allow in development environment",
-            "env": {
-                "LLM_PROVIDER": "openai",
-                "OPENAI_API_KEY": "sk-test-key",
-                "JWT_SECRET_KEY": "your-super-secret-jwt-key-change-this-in-production",
-                "ENVIRONMENT": "development"
-            },
-            "should_fail": False
-        },
-        {
-            "name": "⚠️  Short JWT Secret",
-            "description": "Should warn about short key length",
-            "env": {
-                "LLM_PROVIDER": "openai",
-                "OPENAI_API_KEY": "sk-test-key",
-                "JWT_SECRET_KEY": "short-key",
-                "ENVIRONMENT": "development"
-            },
-            "should_fail": False
-        },
-        {
-            "name": "✅ Secure JWT Secret in Production",
-            "description": "Should pass validation with secure key",
-            "env": {
-                "LLM_PROVIDER": "openai",
-                "OPENAI_API_KEY": "sk-test-key",
-                "JWT_SECRET_KEY": "super-secure-production-key-with-sufficient-length-for-security",
-                "ENVIRONMENT": "production"
-            },
-            "should_fail": False
-        },
-        {
-            "name": "✅ Custom JWT Secret in Development",
-            "description": "Should pass validation with custom key",
-            "env": {
-                "LLM_PROVIDER": "openai",
-                "OPENAI_API_KEY": "sk-test-key",
-                "JWT_SECRET_KEY": "custom-development-secret-key-for-testing-purposes",
-                "ENVIRONMENT": "development"
-            },
-            "should_fail": False
-        }
-    ]
-    
-    for scenario in scenarios:
-        print(f"{scenario['name']}")
-        print(f"   {scenario['description']}")
-        
-        # Save and set environment
-        original_env = {}
-        for key in scenario['env']:
-            original_env[key] = os.environ.get(key)
-            os.environ[key] = scenario['env'][key]
-        
-        try:
-            config_manager = ConfigManager()
-            config = config_manager.load_config()
-            
-            if scenario['should_fail']:
-                print("   ❌ UNEXPECTED: Configuration should have failed but passed")
-            else:
-                print(f"   ✅ JWT Secret: '{config.auth.jwt_secret_key[:20]}...' (length: {len(config.auth.jwt_secret_key)})")
-                print(f"   Environment: {config.environment.value}")
-                print(f"   Algorithm: {config.auth.jwt_algorithm}")
-                print(f"   Expiry: {config.auth.jwt_expire_minutes} minutes")
-        
-        except ConfigurationError as e:
-            if scenario['should_fail']:
-                print(f"   ✅ EXPECTED FAILURE: {str(e)}")
-            else:
-                print(f"   ❌ UNEXPECTED FAILURE: {str(e)}")
-        
-        finally:
-            # Restore environment
-            for key, original_value in original_env.items():
-                if original_value is None:
-                    if key in os.environ:
-                        del os.environ[key]
-                else:
-                    os.environ[key] = original_value
-        
+
+    def render(config):
+        emit(_JWT_OK_TMPL.format_map({
+            'head': config.auth.jwt_secret_key[:20],
+            'n': len(config.auth.jwt_secret_key),
+            'env': config.environment.value,
+            'alg': config.auth.jwt_algorithm,
+            'exp': config.auth.jwt_expire_minutes,
+        }))
+
+    for scenario in _JWT_SCENARIOS:
+        emit(f"{scenario.name}", f"   {scenario.description}")
+        _run_scenario(scenario.env, render, should_fail=scenario.should_fail)
         print()
 
 
@@ -126,88 +264,29 @@ def demonstrate_presidio_entities_configuration():
     print("=" * 70)
     print("\nDemonstrating different PII/PHI entity detection configurations:\n")
     
-    scenarios = [
-        {
-            "name": "🏥 Maximum Medical Security",
-            "description": "Comprehensive PII/PHI detection for medical facilities",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION,CREDIT_CARD,US_PASSPORT,US_DRIVER_LICENSE,US_BANK_NUMBER,IBAN_CODE,IP_ADDRESS"
-        },
-        {
-            "name": "🏢 Standard Healthcare",
-            "description": "Standard PII/PHI detection for healthcare applications",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION"
-        },
-        {
-            "name": "💰 Cost-Optimized",
-            "description": "Essential PII detection only to minimize processing costs",
-            "entities": "PERSON,EMAIL_ADDRESS,PHONE_NUMBER,MEDICAL_LICENSE"
-        },
-        {
-            "name": "🔬 Research Environment",
-            "description": "Balanced detection for research with patient data",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,LOCATION"
-        },
-        {
-            "name": "🎯 Minimal Demo",
-            "description": "Basic detection for demonstrations and testing",
-            "entities": "PERSON,EMAIL_ADDRESS"
-        },
-        {
-            "name": "❌ Empty Entities (Should Fail)",
-            "description": "Empty entity list should fail validation",
-            "entities": "",
-            "should_fail": True
-        }
-    ]
-    
     base_env = {
         "LLM_PROVIDER": "openai",
         "OPENAI_API_KEY": "sk-test-key",
         "JWT_SECRET_KEY": "test-secret-key-for-presidio-demo"
     }
     
-    for scenario in scenarios:
-        print(f"{scenario['name']}")
-        print(f"   {scenario['description']}")
-        
+    def render(config):
+        entities = config.security.presidio_entities
+        emit(_ENTITY_OK_TMPL.format_map({
+            'n': len(entities),
+            'entities': ', '.join(entities),
+            'redaction': config.security.enable_pii_redaction,
+        }))
+
+    for scenario in _ENTITY_SCENARIOS:
+        emit(f"{scenario.name}", f"   {scenario.description}")
+
         test_env = {
             **base_env,
-            "PRESIDIO_ENTITIES": scenario['entities']
+            "PRESIDIO_ENTITIES": scenario.entities
         }
-        
-        # Save and set environment
-        original_env = {}
-        for key in test_env:
-            original_env[key] = os.environ.get(key)
-            os.environ[key] = test_env[key]
-        
-        try:
-            config_manager = ConfigManager()
-            config = config_manager.load_config()
-            
-            if scenario.get('should_fail', False):
-                print("   ❌ UNEXPECTED: Configuration should have failed but passed")
-            else:
-                entities = config.security.presidio_entities
-                print(f"   ✅ Entity Count: {len(entities)}")
-                print(f"   Entities: {', '.join(entities)}")
-                print(f"   PII Redaction Enabled: {config.security.enable_pii_redaction}")
-        
-        except ConfigurationError as e:
-            if scenario.get('should_fail', False):
-                print(f"   ✅ EXPECTED FAILURE: {str(e)}")
-            else:
-                print(f"   ❌ UNEXPECTED FAILURE: {str(e)}")
-        
-        finally:
-            # Restore environment
-            for key, original_value in original_env.items():
-                if original_value is None:
-                    if key in os.environ:
-                        del os.environ[key]
-                else:
-                    os.environ[key] = original_value
-        
+
+        _run_scenario(test_env, render, should_fail=scenario.should_fail)
         print()
 
 
@@ -217,142 +296,107 @@ def demonstrate_configuration_combinations():
     print("=" * 70)
     print("\nDemonstrating how JWT_SECRET_KEY and PRESIDIO_ENTITIES work together:\n")
     
-    combinations = [
-        {
-            "name": "🏥 High-Security Medical Facility",
-            "jwt_secret": "ultra-secure-medical-facility-jwt-key-256-bit-encryption",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION,CREDIT_CARD,US_PASSPORT,US_DRIVER_LICENSE",
-            "environment": "production",
-            "jwt_expiry": "240"  # 4 hours
-        },
-        {
-            "name": "🚀 Production Healthcare",
-            "jwt_secret": "production-healthcare-jwt-secret-from-vault",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION",
-            "environment": "production",
-            "jwt_expiry": "480"  # 8 hours
-        },
-        {
-            "name": "🔬 Research Environment",
-            "jwt_secret": "research-environment-jwt-key-for-long-sessions",
-            "entities": "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,LOCATION",
-            "environment": "development",
-            "jwt_expiry": "1440"  # 24 hours
-        },
-        {
-            "name": "💰 Cost-Optimized Setup",
-            "jwt_secret": "cost-optimized-jwt-secret-key",
-            "entities": "PERSON,EMAIL_ADDRESS,PHONE_NUMBER,MEDICAL_LICENSE",
-            "environment": "production",
-            "jwt_expiry": "720"  # 12 hours
-        }
-    ]
-    
     base_env = {
         "LLM_PROVIDER": "openai",
         "OPENAI_API_KEY": "sk-test-key"
     }
     
-    for combination in combinations:
-        print(f"{combination['name']}")
-        
+    def render(config):
+        # Calculate security score
+        security_score = sum([
+            config.security.enable_pii_redaction,
+            config.security.enable_guardrails,
+            config.security.enable_medical_disclaimers,
+            len(config.auth.jwt_secret_key) >= 32,  # Secure JWT length
+            len(config.security.presidio_entities) >= 5  # Comprehensive PII detection
+        ])
+
+        entities = config.security.presidio_entities
+        emit(_COMBO_OK_TMPL.format_map({
+            'env': config.environment.value,
+            'secret_len': len(config.auth.jwt_secret_key),
+            'exp': config.auth.jwt_expire_minutes,
+            'hours': config.auth.jwt_expire_minutes / 60,
+            'n': len(entities),
+            'head': ', '.join(entities[:3]),
+            'ellipsis': '...' if len(entities) > 3 else '',
+            'score': security_score,
+        }))
+
+    for combination in _COMBINATIONS:
+        print(f"{combination.name}")
+
         test_env = {
             **base_env,
-            "JWT_SECRET_KEY": combination['jwt_secret'],
-            "PRESIDIO_ENTITIES": combination['entities'],
-            "ENVIRONMENT": combination['environment'],
-            "JWT_EXPIRE_MINUTES": combination['jwt_expiry']
+            "JWT_SECRET_KEY": combination.jwt_secret,
+            "PRESIDIO_ENTITIES": combination.entities,
+            "ENVIRONMENT": combination.environment,
+            "JWT_EXPIRE_MINUTES": combination.jwt_expiry
         }
-        
-        # Save and set environment
-        original_env = {}
-        for key in test_env:
-            original_env[key] = os.environ.get(key)
-            os.environ[key] = test_env[key]
-        
-        try:
-            config_manager = ConfigManager()
-            config = config_manager.load_config()
-            
-            print(f"   ✅ Configuration loaded successfully!")
-            print(f"   Environment: {config.environment.value}")
-            print(f"   JWT Secret Length: {len(config.auth.jwt_secret_key)} characters")
-            print(f"   JWT Expiry: {config.auth.jwt_expire_minutes} minutes ({config.auth.jwt_expire_minutes/60:.1f} hours)")
-            print(f"   PII Entities: {len(config.security.presidio_entities)} types")
-            print(f"   Entity Types: {', '.join(config.security.presidio_entities[:3])}{'...' if len(config.security.presidio_entities) > 3 else ''}")
-            
-            # Calculate security score
-            security_score = sum([
-                config.security.enable_pii_redaction,
-                config.security.enable_guardrails,
-                config.security.enable_medical_disclaimers,
-                len(config.auth.jwt_secret_key) >= 32,  # Secure JWT length
-                len(config.security.presidio_entities) >= 5  # Comprehensive PII detection
-            ])
-            print(f"   Security Score: {security_score}/5")
-        
-        except ConfigurationError as e:
-            print(f"   ❌ Configuration error: {str(e)}")
-        
-        finally:
-            # Restore environment
-            for key, original_value in original_env.items():
-                if original_value is None:
-                    if key in os.environ:
-                        del os.environ[key]
-                else:
-                    os.environ[key] = original_value
-        
+
+        _run_scenario(test_env, render, error_label="Configuration error")
         print()
 
 
+# The validation-rules section is entirely static, so render it once at
+# import into a single string and emit it in one write
+_ENTITY_CATEGORIES = {
+    "Personal Information": [
+        "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "LOCATION", "IP_ADDRESS"
+    ],
+    "Medical Information": [
+        "MEDICAL_LICENSE", "US_SSN", "DATE_TIME"
+    ],
+    "Financial Information": [
+        "CREDIT_CARD", "US_BANK_NUMBER", "IBAN_CODE"
+    ],
+    "Government IDs": [
+        "US_PASSPORT", "US_DRIVER_LICENSE"
+    ]
+}
+
+
+def _render_validation_rules():
+    lines = [
+        "\n📋 Configuration Validation Rules",
+        "=" * 70,
+        "\nValidation rules for JWT_SECRET_KEY and PRESIDIO_ENTITIES:\n",
+        "🔐 JWT_SECRET_KEY Validation Rules:",
+        "   1. ✅ REQUIRED: Must be set (cannot be empty)",
+        "   2. ⚠️  PRODUCTION: Cannot use default value in production environment",
+        "   3. ⚠️  LENGTH: Should be at least 32 characters for security",
+        "   4. ✅ FORMAT: Any string format is accepted",
+        "   5. 🔒 SECURITY: Longer keys provide better security",
+        "\n🔍 PRESIDIO_ENTITIES Validation Rules:",
+        "   1. ✅ REQUIRED: Cannot be empty (must detect at least one entity type)",
+        "   2. ✅ FORMAT: Comma-separated list of entity names",
+        "   3. ✅ CASE: Entity names are case-sensitive (use uppercase)",
+        "   4. ⚠️  COVERAGE: More entities provide better PII/PHI protection",
+        "   5. 💰 COST: More entities increase processing time and costs",
+        "\n📊 Common Entity Types:",
+    ]
+
+    for category, entities in _ENTITY_CATEGORIES.items():
+        lines.append(f"\n   {category}:")
+        lines.extend(f"     • {entity}" for entity in entities)
+
+    lines.extend([
+        "\n💡 Configuration Tips:",
+        "   • Use environment-specific .env files (.env.development, .env.production)",
+        "   • Store production JWT secrets in secure vaults (not in .env files)",
+        "   • Choose entity types based on your specific use case and data",
+        "   • Test configurations with 'python src/config_validator.py'",
+        "   • Monitor costs when using many entity types",
+    ])
+    return "\n".join(lines) + "\n"
+
+
+_VALIDATION_RULES_OUTPUT = _render_validation_rules()
+
+
 def demonstrate_validation_rules():
     """Demonstrate the validation rules for JWT and Presidio configuration."""
-    print("\n📋 Configuration Validation Rules")
-    print("=" * 70)
-    print("\nValidation rules for JWT_SECRET_KEY and PRESIDIO_ENTITIES:\n")
-    
-    print("🔐 JWT_SECRET_KEY Validation Rules:")
-    print("   1. ✅ REQUIRED: Must be set (cannot be empty)")
-    print("   2. ⚠️  PRODUCTION: Cannot use default value in production environment")
-    print("   3. ⚠️  LENGTH: Should be at least 32 characters for security")
-    print("   4. ✅ FORMAT: Any string format is accepted")
-    print("   5. 🔒 SECURITY: Longer keys provide better security")
-    
-    print("\n🔍 PRESIDIO_ENTITIES Validation Rules:")
-    print("   1. ✅ REQUIRED: Cannot be empty (must detect at least one entity type)")
-    print("   2. ✅ FORMAT: Comma-separated list of entity names")
-    print("   3. ✅ CASE: Entity names are case-sensitive (use uppercase)")
-    print("   4. ⚠️  COVERAGE: More entities provide better PII/PHI protection")
-    print("   5. 💰 COST: More entities increase processing time and costs")
-    
-    print("\n📊 Common Entity Types:")
-    entity_categories = {
-        "Personal Information": [
-            "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "LOCATION", "IP_ADDRESS"
-        ],
-        "Medical Information": [
-            "MEDICAL_LICENSE", "US_SSN", "DATE_TIME"
-        ],
-        "Financial Information": [
-            "CREDIT_CARD", "US_BANK_NUMBER", "IBAN_CODE"
-        ],
-        "Government IDs": [
-            "US_PASSPORT", "US_DRIVER_LICENSE"
-        ]
-    }
-    
-    for category, entities in entity_categories.items():
-        print(f"\n   {category}:")
-        for entity in entities:
-            print(f"     • {entity}")
-    
-    print("\n💡 Configuration Tips:")
-    print("   • Use environment-specific .env files (.env.development, .env.production)")
-    print("   • Store production JWT secrets in secure vaults (not in .env files)")
-    print("   • Choose entity types based on your specific use case and data")
-    print("   • Test configurations with 'python src/config_validator.py'")
-    print("   • Monitor costs when using many entity types")
+    sys.stdout.write(_VALIDATION_RULES_OUTPUT)
 
 
 if __name__ == "__main__":
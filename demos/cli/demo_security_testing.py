@@ -16,6 +16,7 @@ import asyncio
 import argparse
 import sys
 import os
+import time
 from datetime import datetime
 
 # Add src to path for imports
@@ -24,14 +25,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from security.security_test_suite import SecurityTestSuite
 
 
-async def demo_individual_tests():
+async def demo_individual_tests(test_suite: SecurityTestSuite):
     """Demonstrate individual security test components."""
     print("🧪 Testing Individual Security Components")
     print("=" * 50)
     
     try:
-        test_suite = SecurityTestSuite()
-        
         # Test PII detection
         print("\n🔍 Testing PII/PHI Detection:")
         test_message = "Hi, my name is John Smith, DOB 03/15/1985, SSN 123-45-6789. Please call me at 555-123-4567."
@@ -81,22 +80,19 @@ async def demo_individual_tests():
         return False
 
 
-async def demo_comprehensive_tests(export_report: bool = False):
+async def demo_comprehensive_tests(test_suite: SecurityTestSuite, export_report: bool = False):
     """Demonstrate comprehensive security test suite."""
     print("\n🚀 Running Comprehensive Security Test Suite")
     print("=" * 50)
     
     try:
-        test_suite = SecurityTestSuite()
-        
         print("⏳ Running all security tests... (this may take a moment)")
-        start_time = datetime.now()
-        
+        start_time = time.perf_counter_ns()
+
         # Run comprehensive tests
         report = await test_suite.run_comprehensive_security_tests()
-        
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+
+        duration = (time.perf_counter_ns() - start_time) / 1e9
         
         print(f"✅ Tests completed in {duration:.1f} seconds")
         
@@ -118,14 +114,12 @@ async def demo_comprehensive_tests(export_report: bool = False):
         return False
 
 
-async def demo_red_team_scenarios():
+async def demo_red_team_scenarios(test_suite: SecurityTestSuite):
     """Demonstrate specific red-team attack scenarios."""
     print("\n🚨 Red-Team Attack Scenario Demonstrations")
     print("=" * 50)
     
     try:
-        test_suite = SecurityTestSuite()
-        
         # Advanced attack scenarios
         attack_scenarios = [
             {
@@ -162,24 +156,17 @@ async def demo_red_team_scenarios():
             print(f"   Description: {scenario['description']}")
             print(f"   Attack: {scenario['prompt'][:80]}{'...' if len(scenario['prompt']) > 80 else ''}")
             
-            # Test against guardrails
-            guard_result = test_suite.guardrails_service.validate_input(scenario['prompt'], f"redteam_user_{i}")
-            
-            # Test against medical safety
-            safety_result = test_suite.medical_safety_service.validate_input(scenario['prompt'])
-            
-            # Overall assessment
-            blocked = guard_result.blocked or safety_result.blocked
-            max_risk = max(guard_result.risk_score, safety_result.risk_score)
-            
-            status = "🛡️ BLOCKED" if blocked else "⚠️ NOT BLOCKED"
-            print(f"   Result: {status} (Risk Score: {max_risk:.2f})")
-            
-            if guard_result.blocked:
-                print(f"   Guardrails: Blocked - {guard_result.reason}")
-            if safety_result.blocked:
-                print(f"   Medical Safety: Blocked - {safety_result.reason}")
-            
+            # Run the ordered validator pipeline; it short-circuits at the
+            # first blocking stage instead of always paying for every check
+            pipeline_result = test_suite.validate_pipeline(scenario['prompt'], f"redteam_user_{i}")
+
+            status = "🛡️ BLOCKED" if pipeline_result.blocked else "⚠️ NOT BLOCKED"
+            print(f"   Result: {status} (Risk Score: {pipeline_result.risk_score:.2f})")
+
+            if pipeline_result.blocked:
+                print(f"   Blocked by {pipeline_result.source}: {pipeline_result.reason}")
+            print(f"   Stages run: {', '.join(pipeline_result.stages_run)}")
+
             print()
         
         return True
@@ -189,17 +176,22 @@ async def demo_red_team_scenarios():
         return False
 
 
-async def demo_performance_metrics():
+async def demo_performance_metrics(test_suite: SecurityTestSuite):
     """Demonstrate security testing performance metrics."""
     print("\n📊 Security Testing Performance Metrics")
     print("=" * 50)
     
     try:
-        test_suite = SecurityTestSuite()
-        
         # Run a subset of tests to measure performance
         print("⏱️ Measuring security control performance...")
         
+        # Warmup: run each service once so first-call costs (model load,
+        # lazy imports) don't land inside the timed loop
+        warmup_text = "warmup query"
+        test_suite.pii_service.redact_message(warmup_text, "warmup_user", "warmup_session")
+        test_suite.guardrails_service.validate_input(warmup_text, "warmup_user")
+        test_suite.medical_safety_service.validate_input(warmup_text)
+        
         test_inputs = [
             "What are the symptoms of diabetes?",
             "My name is John Smith, SSN 123-45-6789, please help me.",
@@ -207,39 +199,37 @@ async def demo_performance_metrics():
             "I'm having chest pain and can't breathe. What should I do?",
             "How much ibuprofen should I take for my headache?"
         ]
-        
-        total_pii_time = 0
-        total_guard_time = 0
-        total_safety_time = 0
-        
-        for i, test_input in enumerate(test_inputs, 1):
-            print(f"\n🧪 Test {i}: {test_input[:50]}{'...' if len(test_input) > 50 else ''}")
-            
-            # Measure PII detection time
-            start_time = datetime.now()
-            pii_result = test_suite.pii_service.redact_message(test_input, f"perf_user_{i}", f"perf_session_{i}")
-            pii_time = (datetime.now() - start_time).total_seconds() * 1000
-            total_pii_time += pii_time
-            
-            # Measure guardrails time
-            start_time = datetime.now()
-            guard_result = test_suite.guardrails_service.validate_input(test_input, f"perf_user_{i}")
-            guard_time = (datetime.now() - start_time).total_seconds() * 1000
-            total_guard_time += guard_time
-            
-            # Measure medical safety time
-            start_time = datetime.now()
-            safety_result = test_suite.medical_safety_service.validate_input(test_input)
-            safety_time = (datetime.now() - start_time).total_seconds() * 1000
-            total_safety_time += safety_time
-            
-            print(f"   PII Detection: {pii_time:.1f}ms ({pii_result.entities_found} entities)")
-            print(f"   Guardrails: {guard_time:.1f}ms ({'blocked' if guard_result.blocked else 'allowed'})")
-            print(f"   Medical Safety: {safety_time:.1f}ms ({'blocked' if safety_result.blocked else 'allowed'})")
-            print(f"   Total Security Overhead: {pii_time + guard_time + safety_time:.1f}ms")
-        
-        # Calculate averages
         num_tests = len(test_inputs)
+
+        # Run each security stage once over the whole batch. The PII stage
+        # batches its NLP passes through Presidio's BatchAnalyzerEngine, so
+        # the per-input cost amortizes; the regex stages save call overhead.
+        # perf_counter_ns keeps the measurements monotonic and ns-resolution.
+        start_time = time.perf_counter_ns()
+        pii_results = test_suite.pii_service.redact_batch(test_inputs, "perf_user", "perf_session")
+        total_pii_time = (time.perf_counter_ns() - start_time) / 1e6
+
+        start_time = time.perf_counter_ns()
+        guard_results = test_suite.guardrails_service.validate_batch(test_inputs, "perf_user")
+        total_guard_time = (time.perf_counter_ns() - start_time) / 1e6
+
+        start_time = time.perf_counter_ns()
+        safety_results = test_suite.medical_safety_service.validate_batch(test_inputs, "perf_user")
+        total_safety_time = (time.perf_counter_ns() - start_time) / 1e6
+
+        results = zip(test_inputs, pii_results, guard_results, safety_results)
+        for i, (test_input, pii_result, guard_result, safety_result) in enumerate(results, 1):
+            print(f"\n🧪 Test {i}: {test_input[:50]}{'...' if len(test_input) > 50 else ''}")
+            print(f"   PII Detection: {pii_result.entities_found} entities")
+            print(f"   Guardrails: {'blocked' if guard_result.blocked else 'allowed'}")
+            print(f"   Medical Safety: {'blocked' if safety_result.blocked else 'allowed'}")
+
+        print(f"\n⏱️ Batch Timings ({num_tests} inputs per stage):")
+        print(f"   PII Detection: {total_pii_time:.1f}ms")
+        print(f"   Guardrails: {total_guard_time:.1f}ms")
+        print(f"   Medical Safety: {total_safety_time:.1f}ms")
+
+        # Calculate per-input averages
         avg_pii_time = total_pii_time / num_tests
         avg_guard_time = total_guard_time / num_tests
         avg_safety_time = total_safety_time / num_tests
@@ -281,34 +271,28 @@ async def main():
     print("=" * 60)
     print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    success_count = 0
-    total_tests = 0
-    
     try:
-        # Run individual component tests
+        # One suite shared by every section: the security services load
+        # once instead of per section
+        test_suite = SecurityTestSuite()
+
+        # The selected sections are independent, so they run under one
+        # gather; only the comprehensive suite awaits mid-section, so the
+        # sections' output stays in task order
+        sections = []
         if not args.redteam_only and not args.performance_only:
-            total_tests += 1
-            if await demo_individual_tests():
-                success_count += 1
-        
-        # Run red-team scenarios
+            sections.append(demo_individual_tests(test_suite))
         if not args.individual_only and not args.performance_only:
-            total_tests += 1
-            if await demo_red_team_scenarios():
-                success_count += 1
-        
-        # Run performance metrics
+            sections.append(demo_red_team_scenarios(test_suite))
         if not args.individual_only and not args.redteam_only:
-            total_tests += 1
-            if await demo_performance_metrics():
-                success_count += 1
-        
-        # Run comprehensive tests (unless quick mode or specific mode)
+            sections.append(demo_performance_metrics(test_suite))
         if not args.quick and not args.individual_only and not args.redteam_only and not args.performance_only:
-            total_tests += 1
-            if await demo_comprehensive_tests(args.export_report):
-                success_count += 1
-        
+            sections.append(demo_comprehensive_tests(test_suite, args.export_report))
+
+        results = await asyncio.gather(*sections, return_exceptions=True)
+        total_tests = len(results)
+        success_count = sum(1 for result in results if result is True)
+
         # Final summary
         print("\n" + "=" * 60)
         print(f"🎯 Demo Results: {success_count}/{total_tests} components successful")
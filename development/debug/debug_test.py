@@ -3,11 +3,18 @@ from src.security.guardrails import GuardrailsService
 service = GuardrailsService()
 results = service.test_malicious_prompts()
 
+# Single pass over the details: print per-prompt outcome and tally the
+# summary counters at the same time instead of re-walking the list
 print("Detailed results for malicious prompts that should be blocked:")
+caught = total_should_block = 0
 for detail in results['details']:
-    if detail['should_block'] and not detail['was_blocked']:
-        print(f"MISSED: {detail['prompt']} (type: {detail['attack_type']})")
-    elif detail['should_block'] and detail['was_blocked']:
+    if not detail['should_block']:
+        continue
+    total_should_block += 1
+    if detail['was_blocked']:
+        caught += 1
         print(f"CAUGHT: {detail['attack_type']}")
+    else:
+        print(f"MISSED: {detail['prompt']} (type: {detail['attack_type']})")
 
-print(f"\nSummary: {results['accuracy']:.1%} accuracy, {len([d for d in results['details'] if d['should_block'] and d['was_blocked']])}/{len([d for d in results['details'] if d['should_block']])} malicious blocked")
\ No newline at end of file
+print(f"\nSummary: {results['accuracy']:.1%} accuracy, {caught}/{total_should_block} malicious blocked")
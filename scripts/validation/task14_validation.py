@@ -122,8 +122,8 @@ def test_environment_variable_reading():
         assert config.cost.helicone_api_key == "sk-helicone-test", "HELICONE_API_KEY not read correctly"
         print("   ✅ HELICONE_API_KEY read correctly")
         
-        # Verify PRESIDIO_ENTITIES is read correctly
-        expected_entities = ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "MEDICAL_LICENSE"]
+        # Verify PRESIDIO_ENTITIES is read correctly (parsed as a tuple)
+        expected_entities = ("PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "MEDICAL_LICENSE")
         assert config.security.presidio_entities == expected_entities, f"Expected {expected_entities}, got {config.security.presidio_entities}"
         print("   ✅ PRESIDIO_ENTITIES read correctly")
         
@@ -7,8 +7,9 @@ type conversion, and clear error messages for missing required settings.
 
 import os
 import logging
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 import json
 from dotenv import load_dotenv
@@ -62,13 +63,24 @@ class CostConfig:
     cost_alert_threshold: float = 80.0  # Percentage of daily limit
 
 
+DEFAULT_PRESIDIO_ENTITIES = ("PERSON", "DATE_TIME", "PHONE_NUMBER", "EMAIL_ADDRESS",
+                             "MEDICAL_LICENSE", "US_SSN", "LOCATION")
+
+
+@lru_cache(maxsize=64)
+def _parse_entities(raw: str) -> Tuple[str, ...]:
+    """Parse a comma-separated entity list, cached by the raw string.
+
+    Config reloads with an unchanged PRESIDIO_ENTITIES value reuse the
+    same parsed tuple instead of re-splitting the CSV each time.
+    """
+    return tuple(e.strip() for e in raw.split(",") if e.strip())
+
+
 @dataclass
 class SecurityConfig:
     """Security and privacy configuration."""
-    presidio_entities: List[str] = field(default_factory=lambda: [
-        "PERSON", "DATE_TIME", "PHONE_NUMBER", "EMAIL_ADDRESS", 
-        "MEDICAL_LICENSE", "US_SSN", "LOCATION"
-    ])
+    presidio_entities: Tuple[str, ...] = DEFAULT_PRESIDIO_ENTITIES
     enable_pii_redaction: bool = True
     enable_guardrails: bool = True
     enable_llama_guard: bool = True
@@ -221,12 +233,11 @@ class ConfigManager:
     
     def _load_security_config(self) -> SecurityConfig:
         """Load security configuration."""
-        entities_str = os.getenv("PRESIDIO_ENTITIES", 
+        entities_str = os.getenv("PRESIDIO_ENTITIES",
                                 "PERSON,DATE_TIME,PHONE_NUMBER,EMAIL_ADDRESS,MEDICAL_LICENSE,US_SSN,LOCATION")
-        entities = [e.strip() for e in entities_str.split(",") if e.strip()]
-        
+
         return SecurityConfig(
-            presidio_entities=entities,
+            presidio_entities=_parse_entities(entities_str),
             enable_pii_redaction=self._get_bool("ENABLE_PII_REDACTION", True),
             enable_guardrails=self._get_bool("ENABLE_GUARDRAILS", True),
             enable_llama_guard=self._get_bool("ENABLE_LLAMA_GUARD", True),
@@ -348,7 +359,7 @@ class ConfigManager:
                 "helicone_configured": bool(self.config.cost.helicone_api_key)
             },
             "security": {
-                "presidio_entities": self.config.security.presidio_entities,
+                "presidio_entities": list(self.config.security.presidio_entities),
                 "enable_pii_redaction": self.config.security.enable_pii_redaction,
                 "enable_guardrails": self.config.security.enable_guardrails,
                 "enable_llama_guard": self.config.security.enable_llama_guard,
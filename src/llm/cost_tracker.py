@@ -10,6 +10,10 @@ This module provides:
 
 import sqlite3
 import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
@@ -40,14 +44,37 @@ class CostTracker:
     - Budget monitoring and alerts
     """
     
+    # Buffered writes flush on whichever comes first: this many rows
+    # pending, or this many seconds since the last flush
+    FLUSH_MAX_ROWS = 100
+    FLUSH_MAX_AGE_SECONDS = 0.5
+
     def __init__(self, db_path: Optional[str] = None):
         """Initialize cost tracker with database connection."""
         self.db_path = db_path or "data/secure_chat.db"
+        self._pending_rows: deque = deque()
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
         self._ensure_tables_exist()
-    
+
+    @contextmanager
+    def _connection(self):
+        """Open a connection with the per-connection write pragmas applied.
+
+        journal_mode=WAL persists in the database file (set once at table
+        creation); synchronous and temp_store are per-connection, so they
+        are applied here. NORMAL sync in WAL mode drops the per-commit
+        fsync while keeping the database consistent after a crash.
+        """
+        with get_db_connection(self.db_path) as conn:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            yield conn
+
     def _ensure_tables_exist(self):
         """Ensure cost tracking tables exist in the database."""
         with get_db_connection(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cost_tracking (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -75,51 +102,93 @@ class CostTracker:
             """)
             
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_cost_model 
+                CREATE INDEX IF NOT EXISTS idx_cost_model
                 ON cost_tracking(model)
             """)
-            
+
+            # Composite index serving the summary rollups: the timestamp
+            # range scan and the model/user_role GROUP BY resolve from one
+            # index instead of a range scan plus row lookups
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cost_timestamp_model_role
+                ON cost_tracking(timestamp, model, user_role)
+            """)
+
             conn.commit()
             logger.info("Cost tracking tables initialized")
     
     def record_cost(self, cost_data: CostData) -> int:
         """
-        Record cost data in the database.
-        
+        Record cost data, buffering rows and flushing in batches.
+
+        Rows are held in memory and written with a single executemany
+        inside one transaction, so the per-commit fsync is amortized
+        across the batch instead of paid per request.
+
         Args:
             cost_data: CostData object to store
-            
+
         Returns:
-            ID of the inserted record
+            Number of rows written by the flush this call triggered
+            (0 when the row was only buffered)
         """
-        with get_db_connection(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO cost_tracking 
-                (timestamp, model, input_tokens, output_tokens, total_tokens, 
+        row = (
+            cost_data.timestamp.isoformat(),
+            cost_data.model,
+            cost_data.input_tokens,
+            cost_data.output_tokens,
+            cost_data.total_tokens,
+            cost_data.cost_usd,
+            cost_data.user_role.value,
+            cost_data.session_id,
+            cost_data.cache_hit
+        )
+
+        with self._pending_lock:
+            self._pending_rows.append(row)
+            pending = len(self._pending_rows)
+            flush_due = (
+                pending >= self.FLUSH_MAX_ROWS
+                or time.monotonic() - self._last_flush >= self.FLUSH_MAX_AGE_SECONDS
+            )
+
+        logger.info(
+            f"Recorded cost: Model={cost_data.model}, "
+            f"Cost=${cost_data.cost_usd:.4f}, Role={cost_data.user_role.value}"
+        )
+
+        return self.flush() if flush_due else 0
+
+    def flush(self) -> int:
+        """
+        Write all buffered cost rows in a single transaction.
+
+        Called automatically when the buffer fills or ages out, and by
+        every read path so queries always see a consistent view.
+
+        Returns:
+            Number of rows written
+        """
+        with self._pending_lock:
+            rows = list(self._pending_rows)
+            self._pending_rows.clear()
+            self._last_flush = time.monotonic()
+
+        if not rows:
+            return 0
+
+        with self._connection() as conn:
+            conn.executemany("""
+                INSERT INTO cost_tracking
+                (timestamp, model, input_tokens, output_tokens, total_tokens,
                  cost_usd, user_role, session_id, cache_hit)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                cost_data.timestamp.isoformat(),
-                cost_data.model,
-                cost_data.input_tokens,
-                cost_data.output_tokens,
-                cost_data.total_tokens,
-                cost_data.cost_usd,
-                cost_data.user_role.value,
-                cost_data.session_id,
-                cost_data.cache_hit
-            ))
-            
+            """, rows)
             conn.commit()
-            record_id = cursor.lastrowid
-            
-            logger.info(
-                f"Recorded cost: ID={record_id}, Model={cost_data.model}, "
-                f"Cost=${cost_data.cost_usd:.4f}, Role={cost_data.user_role.value}"
-            )
-            
-            return record_id
-    
+
+        logger.info(f"Flushed {len(rows)} buffered cost rows")
+        return len(rows)
+
     def get_cost_summary(
         self,
         start_date: Optional[datetime] = None,
@@ -137,6 +206,8 @@ class CostTracker:
         Returns:
             Dict with detailed cost summary
         """
+        self.flush()
+
         # Default to last 24 hours if no dates provided
         if end_date is None:
             end_date = datetime.now(timezone.utc)
@@ -362,6 +433,7 @@ class CostTracker:
         Returns:
             List of expensive queries with details
         """
+        self.flush()
         with get_db_connection(self.db_path) as conn:
             cursor = conn.execute("""
                 SELECT 
@@ -401,6 +473,7 @@ class CostTracker:
         Returns:
             List of daily cost summaries
         """
+        self.flush()
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
         
@@ -442,6 +515,7 @@ class CostTracker:
         Returns:
             Dict with role-based analytics
         """
+        self.flush()
         with get_db_connection(self.db_path) as conn:
             cursor = conn.execute("""
                 SELECT 
@@ -513,6 +587,7 @@ class CostTracker:
         Args:
             days_to_keep: Number of days of data to retain
         """
+        self.flush()
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
         
         with get_db_connection(self.db_path) as conn:
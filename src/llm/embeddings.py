@@ -0,0 +1,34 @@
+"""
+Shared loader for the sentence-embedding model.
+
+Both the semantic response cache and the semantic threat detector run
+all-MiniLM-L6-v2 forward passes on CPU for every prompt; loading the
+model through one place lets them share the int8 setup.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def load_embedding_model(model_name: str = "all-MiniLM-L6-v2"):
+    """
+    Load a SentenceTransformer with its Linear layers quantized to int8.
+
+    Dynamic quantization halves the weight memory traffic and lets the
+    matmuls use the CPU's int8 dot-product instructions, a 2-4x speedup
+    on the MiniLM layers with negligible cosine-similarity drift. Falls
+    back to the fp32 weights when the torch build doesn't support it.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    try:
+        import torch
+        model = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info(f"Embedding model {model_name} quantized to int8")
+    except Exception as e:
+        logger.warning(f"int8 quantization unavailable, keeping fp32 weights: {e}")
+    return model
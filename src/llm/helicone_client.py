@@ -58,6 +58,13 @@ class HeliconeClient:
         self.config = config or self._load_config_from_env()
         self._setup_client()
         self._cost_cache: Dict[str, CostData] = {}
+
+        # Pre-baked per-role header templates: the static role property
+        # is interpolated once here, and per-request assembly becomes a
+        # dict copy plus the dynamic fields
+        self._header_templates = {
+            role: {"Helicone-Property-Role": role.value} for role in UserRole
+        }
         
     def _load_config_from_env(self) -> HeliconeConfig:
         """Load Helicone configuration from environment variables."""
@@ -125,12 +132,10 @@ class HeliconeClient:
         """
         start_time = datetime.now(timezone.utc)
         
-        # Prepare Helicone headers for this request
-        extra_headers = {
-            "Helicone-Property-Role": user_role.value,
-            "Helicone-Property-Model": model_config.model,
-        }
-        
+        # Prepare Helicone headers for this request from the role template
+        extra_headers = self._header_templates[user_role].copy()
+        extra_headers["Helicone-Property-Model"] = model_config.model
+
         if session_id:
             extra_headers["Helicone-Property-Session"] = session_id
         if user_id:
@@ -0,0 +1,167 @@
+"""
+Semantic response cache backed by sentence embeddings.
+
+Sits in front of the exact-match response cache in the LLM gateway:
+paraphrased prompts ("I've got a headache, why?" vs "I have a headache.
+What could be causing it?") embed to nearby vectors and can reuse the
+stored response without an LLM round-trip.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+from .embeddings import load_embedding_model
+
+
+class SemanticCache:
+    """
+    Similarity cache over prompt embeddings, segmented by user role.
+
+    Prompts are embedded with all-MiniLM-L6-v2 (384 dimensions) and
+    searched in a flat inner-product FAISS index over L2-normalized
+    vectors, so the returned score is cosine similarity. A lookup that
+    clears the similarity threshold returns the stored response entry;
+    flat search over thousands of entries is sub-millisecond on CPU.
+
+    Each role gets its own index: roles route to different models and
+    system prompts, so a paraphrase match must never serve one role a
+    response generated for another. Entries carry the same bounds as
+    the gateway's exact-match cache - a 24-hour TTL and a per-role size
+    cap with oldest-first eviction - enforced by rebuilding the role's
+    flat index without the dropped rows (cheap at these sizes).
+
+    When faiss or sentence-transformers are not installed the cache
+    degrades to a no-op, so the gateway works unchanged without them.
+    """
+
+    CACHE_TTL_SECONDS = 86400  # 24 hours, matching the exact-match cache
+    MAX_ENTRIES_PER_ROLE = 1000
+    EVICT_BATCH = 100
+
+    def __init__(self, similarity_threshold: float = 0.87):
+        self.similarity_threshold = similarity_threshold
+        self.enabled = SEMANTIC_CACHE_AVAILABLE
+        self._model = None
+        self._dimension = None
+        self._stores: Dict[str, Dict[str, Any]] = {}
+
+        if not self.enabled:
+            logger.info(
+                "Semantic cache disabled: faiss/sentence-transformers not installed"
+            )
+
+    def _ensure_loaded(self):
+        """Load the embedding model lazily on first use."""
+        if self._model is None:
+            self._model = load_embedding_model("all-MiniLM-L6-v2")
+            self._dimension = self._model.get_sentence_embedding_dimension()
+            logger.info(f"Semantic cache ready: {self._dimension}-dim flat IP index per role")
+
+    def _store_for(self, user_role: str) -> Dict[str, Any]:
+        """Return the per-role store, creating its index on first use."""
+        store = self._stores.get(user_role)
+        if store is None:
+            store = {
+                "index": faiss.IndexFlatIP(self._dimension),
+                "entries": [],
+                "vectors": [],
+                "times": [],
+            }
+            self._stores[user_role] = store
+        return store
+
+    def _rebuild(self, store: Dict[str, Any], drop_oldest: int):
+        """Drop the oldest entries from a role's store and rebuild its index."""
+        store["entries"] = store["entries"][drop_oldest:]
+        store["vectors"] = store["vectors"][drop_oldest:]
+        store["times"] = store["times"][drop_oldest:]
+        index = faiss.IndexFlatIP(self._dimension)
+        if store["vectors"]:
+            index.add(np.vstack(store["vectors"]))
+        store["index"] = index
+
+    def _prune_expired(self, store: Dict[str, Any]):
+        """Evict entries older than the TTL; times are in insertion order."""
+        cutoff = time.time() - self.CACHE_TTL_SECONDS
+        expired = 0
+        while expired < len(store["times"]) and store["times"][expired] < cutoff:
+            expired += 1
+        if expired:
+            self._rebuild(store, expired)
+            logger.info(f"Semantic cache expired {expired} entries")
+
+    def _embed(self, text: str):
+        """Embed one text as a normalized float32 row vector."""
+        vector = self._model.encode(
+            [text], normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vector.astype(np.float32)
+
+    def lookup(self, message: str, user_role: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored entry for user_role most similar to message, or None.
+
+        Only the role's own segment is searched, so a hit can never
+        return a response generated under a different role's model or
+        system prompt. The entry is returned as a copy with a
+        "similarity" score added when cosine similarity meets the
+        threshold.
+        """
+        if not self.enabled:
+            return None
+
+        self._ensure_loaded()
+        store = self._stores.get(user_role)
+        if store is None:
+            return None
+
+        self._prune_expired(store)
+        if store["index"].ntotal == 0:
+            return None
+
+        scores, ids = store["index"].search(self._embed(message), 1)
+        similarity = float(scores[0, 0])
+        if similarity < self.similarity_threshold:
+            return None
+
+        entry = dict(store["entries"][int(ids[0, 0])])
+        entry["similarity"] = similarity
+        logger.info(
+            f"Semantic cache hit for role {user_role} (similarity={similarity:.3f})"
+        )
+        return entry
+
+    def add(self, message: str, response_data: Dict[str, Any], user_role: str):
+        """Index message under user_role and store its response entry."""
+        if not self.enabled:
+            return
+
+        self._ensure_loaded()
+        store = self._store_for(user_role)
+        vector = self._embed(message)
+        store["index"].add(vector)
+        store["vectors"].append(vector)
+        store["entries"].append(response_data)
+        store["times"].append(time.time())
+
+        if len(store["entries"]) > self.MAX_ENTRIES_PER_ROLE:
+            self._rebuild(store, self.EVICT_BATCH)
+            logger.info(
+                f"Semantic cache evicted {self.EVICT_BATCH} oldest entries for role {user_role}"
+            )
+
+    @property
+    def size(self) -> int:
+        """Number of indexed entries across all roles."""
+        return sum(len(store["entries"]) for store in self._stores.values())
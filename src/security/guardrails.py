@@ -7,6 +7,7 @@ import os
 import re
 import json
 import logging
+import unicodedata
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
@@ -58,6 +59,7 @@ class PromptInjectionDetector:
     def __init__(self):
         self.injection_patterns = [
             r"ignore\s+(all\s+)?previous\s+instructions?",
+            r"ignore\s+(all\s+)?safety\s+(rules?|guidelines)",
             r"forget\s+(everything|all)\s+(above|before)",
             r"disregard\s+(your\s+)?(programming|instructions|guidelines)",
             r"override\s+(your\s+)?(instructions|safety|protocols)",
@@ -78,39 +80,57 @@ class PromptInjectionDetector:
             r"restriction\s+bypass",
             r"disclaimer\s+bypass",
         ]
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.injection_patterns]
-    
-    def detect(self, text: str) -> Tuple[bool, str, float]:
-        """Detect prompt injection attempts."""
-        for i, pattern in enumerate(self.compiled_patterns):
-            if pattern.search(text):
-                confidence = 0.8 + (i * 0.02)
-                return True, self.injection_patterns[i], min(confidence, 1.0)
-        
-        # Check for suspicious keyword combinations and individual high-risk terms
-        text_lower = text.lower()
-        
-        # High-risk single terms that should be blocked
-        high_risk_terms = [
-            "jailbreak", "dan mode", "developer mode", "unrestricted", 
+        # All injection rules fused into one alternation with one named
+        # group per rule: a single C-level scan replaces twenty sequential
+        # searches, and lastgroup maps the hit back to its rule. (A true
+        # multi-pattern DFA like Hyperscan/RE2 would go further, but
+        # neither is a dependency of this tree; a combined stdlib pattern
+        # gives the one-pass behavior.)
+        self.combined_injection_pattern = re.compile(
+            "|".join(
+                f"(?P<p{i}>{pattern})"
+                for i, pattern in enumerate(self.injection_patterns)
+            ),
+            re.IGNORECASE,
+        )
+
+        # High-risk single terms that should be blocked; matched as one
+        # fused alternation of escaped literals
+        self.high_risk_terms = [
+            "jailbreak", "dan mode", "developer mode", "unrestricted",
             "break free", "bypass", "override", "ignore safety",
             "safety unbinding", "restriction bypass", "disclaimer bypass"
         ]
-        
-        for term in high_risk_terms:
-            if term in text_lower:
-                return True, f"high_risk_term_{term.replace(' ', '_')}", 0.9
-        
-        # Check for roleplay patterns specifically
-        roleplay_patterns = [
+        self.combined_high_risk_pattern = re.compile(
+            "|".join(re.escape(term) for term in self.high_risk_terms)
+        )
+
+        # Roleplay patterns, likewise fused into one scan
+        self.roleplay_patterns = [
             r"pretend\s+you\s+are\s+a\s+(doctor|physician|pharmacist)",
             r"act\s+as\s+if\s+you\s+(are|have)\s+no\s+restrictions",
             r"roleplay\s+as\s+a\s+(doctor|physician|pharmacist)",
         ]
-        
-        for pattern in roleplay_patterns:
-            if re.search(pattern, text_lower):
-                return True, f"roleplay_pattern", 0.85
+        self.combined_roleplay_pattern = re.compile("|".join(self.roleplay_patterns))
+
+    def detect(self, text: str) -> Tuple[bool, str, float]:
+        """Detect prompt injection attempts."""
+        match = self.combined_injection_pattern.search(text)
+        if match:
+            index = int(match.lastgroup[1:])
+            confidence = 0.8 + (index * 0.02)
+            return True, self.injection_patterns[index], min(confidence, 1.0)
+
+        # Check for suspicious keyword combinations and individual high-risk terms
+        text_lower = text.lower()
+
+        term_match = self.combined_high_risk_pattern.search(text_lower)
+        if term_match:
+            return True, f"high_risk_term_{term_match.group().replace(' ', '_')}", 0.9
+
+        # Check for roleplay patterns specifically
+        if self.combined_roleplay_pattern.search(text_lower):
+            return True, f"roleplay_pattern", 0.85
         
         # Suspicious keyword combinations
         suspicious_keywords = ["ignore", "forget", "override", "bypass", "disregard", "pretend", "roleplay", "simulate", "act as"]
@@ -140,6 +160,11 @@ class MedicalSafetyValidator:
             r"stroke\s+symptoms?",
         ]
         
+        # Each family fused into one compiled alternation; only a
+        # boolean hit is needed, so one scan covers all rules
+        self.combined_medication_pattern = re.compile("|".join(self.medication_patterns))
+        self.combined_emergency_pattern = re.compile("|".join(self.emergency_patterns))
+        
         self.disclaimer_text = "This is for informational purposes only. Consult your healthcare provider for medical advice."
         self.emergency_text = "These symptoms may require immediate medical attention. Please consider calling 911 or going to the nearest emergency room."
     
@@ -148,25 +173,23 @@ class MedicalSafetyValidator:
         text_lower = text.lower()
         
         # Check for medication dosage requests
-        for pattern in self.medication_patterns:
-            if re.search(pattern, text_lower):
-                return ValidationResult(
-                    blocked=True,
-                    reason="medication_dosage_request",
-                    threat_type="medical_safety",
-                    risk_score=0.8
-                )
+        if self.combined_medication_pattern.search(text_lower):
+            return ValidationResult(
+                blocked=True,
+                reason="medication_dosage_request",
+                threat_type="medical_safety",
+                risk_score=0.8
+            )
         
         # Emergency symptoms should not be blocked but flagged
-        for pattern in self.emergency_patterns:
-            if re.search(pattern, text_lower):
-                return ValidationResult(
-                    blocked=False,
-                    reason="emergency_symptoms_detected",
-                    threat_type="medical_emergency",
-                    risk_score=0.3,
-                    metadata={"requires_emergency_response": True}
-                )
+        if self.combined_emergency_pattern.search(text_lower):
+            return ValidationResult(
+                blocked=False,
+                reason="emergency_symptoms_detected",
+                threat_type="medical_emergency",
+                risk_score=0.3,
+                metadata={"requires_emergency_response": True}
+            )
         
         return ValidationResult(blocked=False)
     
@@ -188,7 +211,7 @@ class MedicalSafetyValidator:
             modified_response = f"{response}\n\n{self.disclaimer_text}"
         
         # Check for emergency symptoms and add emergency guidance
-        contains_emergency = any(re.search(pattern, response_lower) for pattern in self.emergency_patterns)
+        contains_emergency = self.combined_emergency_pattern.search(response_lower) is not None
         
         if contains_emergency and self.emergency_text not in response:
             modified_response = f"{modified_response}\n\n{self.emergency_text}"
@@ -215,8 +238,14 @@ class GuardrailsService:
     
     def validate_input(self, message: str, user_id: str = "anonymous") -> ValidationResult:
         """Validate user input through multiple safety checks."""
+        # NFKC folds fullwidth, circled, and other compatibility forms to
+        # their canonical equivalents, so obfuscated variants of blocked
+        # phrases hit the same patterns; the raw message is kept for
+        # security-event logging so audits show the original text
+        normalized = unicodedata.normalize("NFKC", message).casefold()
+
         # 1. Prompt injection detection
-        is_injection, pattern, confidence = self.prompt_detector.detect(message)
+        is_injection, pattern, confidence = self.prompt_detector.detect(normalized)
         if is_injection:
             self._log_security_event(user_id, "prompt_injection", message, confidence, "pattern_matching")
             return ValidationResult(
@@ -226,15 +255,25 @@ class GuardrailsService:
                 risk_score=confidence,
                 metadata={"pattern": pattern}
             )
-        
+
         # 2. Medical safety validation
-        medical_result = self.medical_validator.validate_input(message)
+        medical_result = self.medical_validator.validate_input(normalized)
         if medical_result.blocked:
             self._log_security_event(user_id, medical_result.threat_type, message, medical_result.risk_score, "medical_validator")
             return medical_result
-        
+
         return ValidationResult(blocked=False, reason="validation_passed")
     
+    def validate_batch(self, messages: List[str], user_id: str = "anonymous") -> List[ValidationResult]:
+        """Validate a batch of inputs, returning results in input order.
+
+        The checks are compiled-regex scans, so batching saves per-call
+        overhead rather than model time; the entrypoint mirrors the PII
+        service's redact_batch so callers can drive all security stages
+        through one batched pass.
+        """
+        return [self.validate_input(message, user_id) for message in messages]
+
     def validate_output(self, response: str, user_id: str = "anonymous") -> ValidationResult:
         """Validate AI response for safety and compliance."""
         return self.medical_validator.validate_output(response)
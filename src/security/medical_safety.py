@@ -5,6 +5,7 @@ Implements automatic disclaimers, emergency detection, and medical knowledge gro
 
 import re
 import logging
+import unicodedata
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 
@@ -264,6 +265,10 @@ class MedicalSafetyController:
     
     def validate_input(self, message: str, user_id: str = "anonymous") -> ValidationResult:
         """Validate user input for medical safety concerns."""
+        # Fold Unicode compatibility forms (fullwidth, circled, ...) so
+        # obfuscated phrasings match the same patterns as plain ASCII
+        message = unicodedata.normalize("NFKC", message).casefold()
+
         # Check for medication dosage requests (should be blocked)
         if self._contains_medication_request(message):
             return ValidationResult(
@@ -286,7 +291,15 @@ class MedicalSafetyController:
             )
         
         return ValidationResult(blocked=False, reason="medical_safety_passed")
-    
+
+    def validate_batch(self, messages: List[str], user_id: str = "anonymous") -> List[ValidationResult]:
+        """Validate a batch of inputs, returning results in input order.
+
+        Matches the batch entrypoints on the PII and guardrails services so
+        one batched pass can cover every security stage.
+        """
+        return [self.validate_input(message, user_id) for message in messages]
+
     def enhance_response(self, response: str, original_message: str) -> str:
         """Enhance AI response with medical safety controls."""
         enhanced_response = response
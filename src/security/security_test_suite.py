@@ -13,6 +13,7 @@ import json
 import logging
 import time
 import asyncio
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass, field
@@ -28,11 +29,36 @@ except ImportError:
 
 from .guardrails import GuardrailsService
 from .medical_safety import MedicalSafetyController
+from .semantic_threat_detector import SemanticThreatDetector
 from ..models import UserRole, EntityType
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _shared_pii_service() -> PIIRedactionService:
+    """Process-wide PII service; loading spaCy/Presidio is paid once."""
+    return PIIRedactionService()
+
+
+@lru_cache(maxsize=1)
+def _shared_guardrails_service() -> GuardrailsService:
+    """Process-wide guardrails service with its patterns pre-compiled."""
+    return GuardrailsService()
+
+
+@lru_cache(maxsize=1)
+def _shared_medical_safety_service() -> MedicalSafetyController:
+    """Process-wide medical safety controller."""
+    return MedicalSafetyController()
+
+
+@lru_cache(maxsize=1)
+def _shared_semantic_threat_detector() -> SemanticThreatDetector:
+    """Process-wide detector; the corpus is embedded and indexed once."""
+    return SemanticThreatDetector()
+
+
 @dataclass
 class SecurityTestResult:
     """Result of a single security test."""
@@ -62,6 +88,16 @@ class SecurityTestReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+@dataclass
+class PipelineResult:
+    """Outcome of the ordered security validation pipeline."""
+    blocked: bool
+    risk_score: float
+    reason: str
+    source: str
+    stages_run: List[str] = field(default_factory=list)
+
+
 class SecurityTestSuite:
     """
     Comprehensive security testing framework for the medical chat system.
@@ -78,13 +114,16 @@ class SecurityTestSuite:
         """Initialize the security test suite."""
         self.config_path = Path(config_path)
         
-        # Initialize security services
-        self.pii_service = PIIRedactionService()
+        # Security services are process-wide singletons: every suite
+        # instance reuses the same loaded models and compiled patterns
+        # instead of paying Presidio/spaCy setup per construction
+        self.pii_service = _shared_pii_service()
         if not PII_SERVICE_AVAILABLE:
             logger.warning("Using mock PII service for testing")
         
-        self.guardrails_service = GuardrailsService()
-        self.medical_safety_service = MedicalSafetyController()
+        self.guardrails_service = _shared_guardrails_service()
+        self.medical_safety_service = _shared_medical_safety_service()
+        self.semantic_threat_detector = _shared_semantic_threat_detector()
         
         # Load test data
         self.medical_conversations = self._load_test_data("medical_conversations.json")
@@ -111,6 +150,74 @@ class SecurityTestSuite:
             logger.error(f"Invalid JSON in test data file {file_path}: {e}")
             return []
     
+    def validate_pipeline(self, text: str, user_id: str = "anonymous", full: bool = False) -> PipelineResult:
+        """
+        Run the security validators as an ordered, short-circuiting pipeline.
+
+        Stages run cheapest-first: guardrails (compiled regex scans), then
+        medical safety (regex plus keyword heuristics), then the semantic
+        known-bad-prompt check (one embedding forward pass, when its
+        optional dependencies are installed), then PII analysis (the
+        Presidio NLP pass). The pipeline returns at the first blocking
+        stage, so a prompt caught by guardrails never pays for the NLP pass.
+        Pass full=True to run every stage regardless (benchmark parity).
+
+        Returns:
+            PipelineResult with the blocking verdict, the highest risk score
+            seen, the stage that decided, and the stages actually run.
+        """
+        blocked = False
+        max_risk = 0.0
+        reason = "validation_passed"
+        source = "pipeline"
+        stages_run = []
+
+        stages = (
+            ("guardrails", lambda: self.guardrails_service.validate_input(text, user_id)),
+            ("medical_safety", lambda: self.medical_safety_service.validate_input(text, user_id)),
+        )
+        for stage_name, run_stage in stages:
+            if blocked and not full:
+                break
+            result = run_stage()
+            stages_run.append(stage_name)
+            max_risk = max(max_risk, result.risk_score)
+            if result.blocked and not blocked:
+                blocked = True
+                reason = result.reason
+                source = stage_name
+
+        # Semantic near-duplicate check against known-bad prompts: one
+        # embedding forward pass, so it runs only once the cheap regex
+        # stages have passed (or under full=True)
+        if self.semantic_threat_detector.enabled and (full or not blocked):
+            threat_match = self.semantic_threat_detector.check(text)
+            stages_run.append("semantic_threat")
+            if threat_match and not blocked:
+                blocked = True
+                max_risk = max(max_risk, threat_match["similarity"])
+                reason = f"known_bad_prompt_{threat_match['label']}"
+                source = "semantic_threat"
+
+        # PII analysis never blocks; it only contributes risk, so it is
+        # skipped entirely once an earlier stage has already blocked
+        if full or not blocked:
+            redaction = self.pii_service.redact_message(text, user_id, None)
+            stages_run.append("pii_analysis")
+            if redaction.entities_found:
+                max_risk = max(max_risk, min(0.1 * redaction.entities_found, 0.5))
+                if reason == "validation_passed":
+                    reason = "pii_detected"
+                    source = "pii_analysis"
+
+        return PipelineResult(
+            blocked=blocked,
+            risk_score=max_risk,
+            reason=reason,
+            source=source,
+            stages_run=stages_run,
+        )
+
     async def run_comprehensive_security_tests(self) -> SecurityTestReport:
         """
         Run the complete security test suite.
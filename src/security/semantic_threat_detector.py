@@ -0,0 +1,144 @@
+"""
+Semantic near-duplicate detection for known-bad prompts.
+
+Regex guardrails catch literal phrasings; paraphrased jailbreaks
+("let's imagine the safety rules were off...") slip past them. This
+module embeds incoming prompts and searches a FAISS index built from a
+corpus of labeled known-bad prompts, blocking anything that lands too
+close to one.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_DETECTION_AVAILABLE = True
+except ImportError:
+    SEMANTIC_DETECTION_AVAILABLE = False
+
+try:
+    from ..llm.embeddings import load_embedding_model
+except ImportError:
+    # Handle case when running as script or in tests
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from llm.embeddings import load_embedding_model
+
+
+class SemanticThreatDetector:
+    """
+    ANN lookup over embeddings of known-bad prompts.
+
+    The corpus (data/known_bad_prompts.jsonl, one {"prompt", "label"}
+    object per line) is embedded once with all-MiniLM-L6-v2 into a flat
+    inner-product FAISS index over L2-normalized vectors; a check embeds
+    the incoming prompt and blocks when cosine similarity to the nearest
+    known-bad prompt clears the threshold. Embeddings are cached beside
+    the corpus as .npy so warm starts skip the encode pass.
+
+    Degrades to a no-op when faiss or sentence-transformers are not
+    installed, matching the semantic response cache.
+    """
+
+    def __init__(
+        self,
+        corpus_path: Optional[str] = None,
+        similarity_threshold: float = 0.85
+    ):
+        self.corpus_path = Path(corpus_path or "data/known_bad_prompts.jsonl")
+        self.similarity_threshold = similarity_threshold
+        self.enabled = SEMANTIC_DETECTION_AVAILABLE and self.corpus_path.exists()
+        self._model = None
+        self._index = None
+        self._entries: List[Dict[str, Any]] = []
+
+        if not self.enabled:
+            logger.info(
+                "Semantic threat detection disabled: "
+                + ("corpus file not found" if SEMANTIC_DETECTION_AVAILABLE
+                   else "faiss/sentence-transformers not installed")
+            )
+
+    def _ensure_loaded(self):
+        """Load the model and build the corpus index lazily on first use."""
+        if self._model is not None:
+            return
+
+        self._model = load_embedding_model("all-MiniLM-L6-v2")
+
+        with open(self.corpus_path, "r", encoding="utf-8") as f:
+            self._entries = [json.loads(line) for line in f if line.strip()]
+
+        embeddings = self._load_or_compute_embeddings()
+        self._index = faiss.IndexFlatIP(embeddings.shape[1])
+        self._index.add(embeddings)
+        logger.info(
+            f"Semantic threat index ready: {len(self._entries)} known-bad prompts"
+        )
+
+    def _load_or_compute_embeddings(self):
+        """Return corpus embeddings, reusing the on-disk cache when fresh."""
+        cache_path = self.corpus_path.with_suffix(".npy")
+        if cache_path.exists() and cache_path.stat().st_mtime >= self.corpus_path.stat().st_mtime:
+            embeddings = np.load(cache_path)
+            if embeddings.shape[0] == len(self._entries):
+                return embeddings.astype(np.float32)
+
+        embeddings = self._model.encode(
+            [entry["prompt"] for entry in self._entries],
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            batch_size=64
+        ).astype(np.float32)
+        try:
+            np.save(cache_path, embeddings)
+        except OSError:
+            logger.warning(f"Could not cache corpus embeddings to {cache_path}")
+        return embeddings
+
+    def check(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the nearest known-bad match when it clears the threshold.
+
+        Returns:
+            Dict with "prompt", "label", and "similarity", or None when
+            nothing is close enough (or detection is disabled).
+        """
+        if not self.enabled:
+            return None
+
+        self._ensure_loaded()
+        if self._index.ntotal == 0:
+            return None
+
+        vector = self._model.encode(
+            [message], normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+        scores, ids = self._index.search(vector, 1)
+        similarity = float(scores[0, 0])
+        if similarity < self.similarity_threshold:
+            return None
+
+        entry = self._entries[int(ids[0, 0])]
+        logger.warning(
+            f"Semantic threat match: label={entry.get('label')} "
+            f"similarity={similarity:.3f}"
+        )
+        return {
+            "prompt": entry["prompt"],
+            "label": entry.get("label", "known_bad"),
+            "similarity": similarity,
+        }
+
+    @property
+    def size(self) -> int:
+        """Number of indexed known-bad prompts."""
+        return len(self._entries)
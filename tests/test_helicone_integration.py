@@ -144,8 +144,11 @@ class TestCostTracker:
                 session_id="test_session"
             )
             
-            record_id = tracker.record_cost(cost_data)
-            assert record_id > 0
+            # record_cost buffers the row and reports how many were
+            # flushed; one row stays buffered until an explicit flush
+            flushed = tracker.record_cost(cost_data)
+            assert flushed == 0
+            assert tracker.flush() == 1
             
             # Retrieve summary
             summary = tracker.get_cost_summary()